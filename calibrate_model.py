@@ -0,0 +1,79 @@
+# calibrate_model.py
+
+import os
+import time
+import numpy as np
+import tensorflow as tf
+from sklearn.linear_model import LogisticRegression
+
+from eeg_dataset import subject_for, load_dataset, compute_metrics
+
+# === Settings === #
+BASE_MODEL_PATH = 'models/anshu_cnn_base_model.h5'
+# Short relax-then-stress recording from data/collect_data.py, named data/<subject>_signal.csv
+# so optimize_models.py can find it for the calibrated model
+CALIBRATION_PATH = 'data/newsubject_signal.csv'
+SUBJECT = subject_for(CALIBRATION_PATH)
+OUTPUT_PATH = f'models/{SUBJECT}_cnn_calibrated_model.h5'
+
+
+def build_feature_extractor(model):
+    """Frozen sub-model that outputs the Dense(64) activations (before Dropout)."""
+    penultimate = next(l for l in reversed(model.layers[:-1]) if isinstance(l, tf.keras.layers.Dense))
+    extractor = tf.keras.Model(inputs=model.inputs, outputs=penultimate.output)
+    extractor.trainable = False
+    return extractor
+
+
+def fit_head(features, labels):
+    """Fit a logistic head and express it as the weights of the Dense(2, softmax) layer.
+
+    softmax([0, z]) == sigmoid(z), so putting the logistic weights in the stress
+    column and zeros in the relax column reproduces the classifier exactly.
+    """
+    head = LogisticRegression(max_iter=1000)
+    head.fit(features, labels)
+
+    kernel = np.zeros((features.shape[1], 2), dtype=np.float32)
+    bias = np.zeros(2, dtype=np.float32)
+    kernel[:, 1] = head.coef_[0]
+    bias[1] = head.intercept_[0]
+    return kernel, bias
+
+
+if __name__ == "__main__":
+    # === Load Base Model and Calibration Recording === #
+    model = tf.keras.models.load_model(BASE_MODEL_PATH)
+    print(f"🤖 Base model loaded from {BASE_MODEL_PATH}")
+
+    X_train, X_test, y_train, y_test = load_dataset(CALIBRATION_PATH)
+    y_train_classes = np.argmax(y_train, axis=1)
+    y_test_classes = np.argmax(y_test, axis=1)
+    print(f"📄 {len(X_train) + len(X_test)} calibration samples from {CALIBRATION_PATH}")
+
+    before = compute_metrics(y_test_classes, np.argmax(model.predict(X_test, verbose=0), axis=1))
+
+    t1 = time.perf_counter()
+
+    # === Cache Penultimate Activations (computed once) === #
+    extractor = build_feature_extractor(model)
+    train_features = extractor.predict(X_train, batch_size=1024, verbose=0)
+
+    # === Fit Output Layer Only === #
+    kernel, bias = fit_head(train_features, y_train_classes)
+    model.layers[-1].set_weights([kernel, bias])
+
+    t2 = time.perf_counter()
+
+    after = compute_metrics(y_test_classes, np.argmax(model.predict(X_test, verbose=0), axis=1))
+
+    # === Save to Model Store === #
+    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+    model.save(OUTPUT_PATH)
+
+    print(f"⏱️ Calibration took {t2 - t1:.2f} s")
+    print(f"Accuracy before: {before['accuracy']*100:.2f}% | after: {after['accuracy']*100:.2f}%")
+    print(f"Precision: {after['precision']:.4f}")
+    print(f"Recall: {after['recall']:.4f}")
+    print(f"F1 Score: {after['f1']:.4f}")
+    print(f"💾 Calibrated model saved to {OUTPUT_PATH}")
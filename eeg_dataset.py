@@ -0,0 +1,51 @@
+# eeg_dataset.py
+
+import os
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import precision_score, recall_score, accuracy_score, f1_score
+
+DATA_DIR = 'data'
+
+
+# === Data (same preprocessing as Train_CNN_Model_v3.ipynb) === #
+def subject_for(path):
+    """Subject name is the file name up to the first underscore (anshu_signal.csv -> anshu)."""
+    return os.path.basename(path).split('_')[0]
+
+
+def data_path_for(model_file):
+    """Map models/<subject>_..._model.h5 to data/<subject>_signal.csv."""
+    return os.path.join(DATA_DIR, f"{subject_for(model_file)}_signal.csv")
+
+
+def load_dataset(data_path):
+    df = pd.read_csv(data_path)
+    df = df[['Fp1', 'Fp2']].astype(float)
+    df = (df - df.mean()) / df.std()  # Normalization
+
+    total_samples = len(df)
+    if total_samples % 2 != 0:
+        df = df[:-1]
+        total_samples -= 1
+
+    half = total_samples // 2
+    labels = np.array([0] * half + [1] * half)  # 0: Relax, 1: Stress
+
+    eeg_data = df.to_numpy().reshape((-1, 1, 2)).astype(np.float32)
+    one_hot_labels = np.zeros((len(labels), 2))
+    one_hot_labels[np.arange(len(labels)), labels] = 1
+
+    return train_test_split(
+        eeg_data, one_hot_labels, test_size=0.2, random_state=42, stratify=one_hot_labels
+    )
+
+
+def compute_metrics(y_true_classes, y_pred_classes):
+    return {
+        'accuracy': accuracy_score(y_true_classes, y_pred_classes),
+        'precision': precision_score(y_true_classes, y_pred_classes),
+        'recall': recall_score(y_true_classes, y_pred_classes),
+        'f1': f1_score(y_true_classes, y_pred_classes),
+    }
@@ -0,0 +1,367 @@
+# log_analytics.py
+
+import os
+import glob
+import time
+import numpy as np
+import pandas as pd
+
+# === Settings === #
+LOG_GLOBS = ['stress_log*.csv', 'game_control_log*.csv', 'arduino_stress_log*.csv']
+STORE_PATH = 'logs_store/sessions.npz'
+PLOT_PATH = 'session_overview.png'
+
+# The logs do not record who wore the headset, so subjects come only from this
+# manual mapping of session ids (see the ids printed by this script)
+DEFAULT_SUBJECT = 'unknown'
+SUBJECTS = {}              # e.g. {'stress_log_20250618_121131@20250618_121133': 'washif'}
+
+LOOP_SLEEP_S = 0.05        # time.sleep() at the end of every logging loop
+MODERATE_THRESHOLD = 50    # Stress % thresholds used by the real-time scripts
+HIGH_THRESHOLD = 90
+MAX_PLOT_POINTS = 2000
+
+STORE_VERSION = 2          # Bump when the stored columns change; older stores are rebuilt
+
+# Row columns of the store, all float64/float32/int8 numpy arrays of equal length
+ROW_COLUMNS = ['session', 't_rel', 't_abs', 'stress', 'latency_ms', 'actuated']
+# Index columns, one entry per session
+INDEX_COLUMNS = ['session_id', 'subject', 'kind', 'source', 'start', 'end',
+                 'offset', 'length', 'mtime', 'size']
+
+
+# === Parsing === #
+def detect_kind(columns):
+    """Identify which script wrote a log from its header."""
+    if 'Relative Time (s)' in columns:
+        return 'realtime'   # stress_detection_realtime.py
+    if 'LED State' in columns:
+        return 'arduino'    # arduino_control_with_log.py
+    if 'Key Pressed' in columns:
+        return 'game'       # game_control_with_log.py
+    if 'Stress Probability' in columns:
+        return 'stress'     # stress_detection_with_log.py
+    raise ValueError(f"Unknown log schema: {list(columns)}")
+
+
+def parse_percent(series):
+    """'97.63%' or 97.63 -> 97.63"""
+    return series.astype(str).str.rstrip('%').astype(np.float32).to_numpy()
+
+
+def to_epoch_seconds(series, fmt):
+    stamps = pd.to_datetime(series, format=fmt).to_numpy().astype('datetime64[ns]')
+    return stamps.astype(np.int64) / 1e9
+
+
+def estimate_relative_time(latency_ms):
+    """Reconstruct sample times from the loop period (inference latency + sleep)."""
+    elapsed = np.cumsum(latency_ms.astype(np.float64) / 1000 + LOOP_SLEEP_S)
+    return elapsed - elapsed[0]
+
+
+def parse_log(path):
+    """Normalize one CSV log into typed numpy columns.
+
+    Returns (kind, columns) or (kind, None) for a log without samples.
+    """
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    kind = detect_kind(df.columns)
+    if df.empty:
+        return kind, None
+
+    latency_ms = df['Latency (ms)'].astype(np.float32).to_numpy()
+
+    if kind == 'realtime':
+        stress = df['Stress Probability (%)'].astype(np.float32).to_numpy()
+        t_rel = df['Relative Time (s)'].astype(np.float64).to_numpy()
+        t_rel = t_rel - t_rel[0]  # Relative to the first sample, like the reconstructed logs
+        t_abs = to_epoch_seconds(df['Timestamp'], '%Y-%m-%d %H:%M:%S.%f')
+    else:
+        column = 'Stress Probability' if kind == 'stress' else 'Stress Probability (%)'
+        stress = parse_percent(df[column])
+        t_rel = estimate_relative_time(latency_ms)
+        stamps = to_epoch_seconds(df['Timestamp'], '%d:%m:%Y:%H:%M:%S')
+        if kind == 'arduino':
+            # Stamped per sample (1 s resolution): anchor at the first sample
+            t_abs = stamps[0] + t_rel
+        else:
+            # Stamped with datetime.now() at save time: anchor at the end of the session
+            t_abs = stamps[-1] - (t_rel[-1] - t_rel)
+
+    # An actuation is a change of the commanded device state (held key or LED),
+    # counting the first command of the session. Repeated identical commands
+    # (the game script re-presses Space, the Arduino script writes every sample)
+    # are not counted, so counts compare across device kinds.
+    if kind == 'game':
+        command = df['Key Pressed'].replace('', np.nan).ffill().fillna('').to_numpy()
+    elif kind == 'arduino':
+        command = df['LED State'].to_numpy()
+    else:
+        command = None
+
+    if command is None:
+        actuated = np.zeros(len(df), dtype=bool)
+    else:
+        actuated = np.r_[command[0] != '', command[1:] != command[:-1]]
+
+    return kind, {
+        't_rel': t_rel,
+        't_abs': t_abs,
+        'stress': stress,
+        'latency_ms': latency_ms,
+        'actuated': actuated.astype(np.int8),
+    }
+
+
+# === Store === #
+def empty_store():
+    store = {c: np.array([], dtype=np.float64) for c in ROW_COLUMNS}
+    store.update({c: np.array([], dtype=np.float64) for c in INDEX_COLUMNS})
+    for c in ('session_id', 'subject', 'kind', 'source'):
+        store[c] = np.array([], dtype=str)
+    return store
+
+
+def load_store(path=STORE_PATH):
+    if not os.path.isfile(path):
+        return empty_store()
+    with np.load(path) as data:
+        if 'version' not in data.files or int(data['version']) != STORE_VERSION:
+            print(f"[!] {path} was written by an older version, rebuilding.")
+            return empty_store()
+        return {k: data[k] for k in data.files if k != 'version'}
+
+
+def save_store(store, path=STORE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez(path, version=STORE_VERSION, **store)
+
+
+def session_slice(store, i):
+    start = int(store['offset'][i])
+    return slice(start, start + int(store['length'][i]))
+
+
+def session_id_for(path, rows):
+    """File name plus first sample time, so an overwritten log becomes a new session."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    start = pd.Timestamp(rows['t_abs'][0], unit='s').strftime('%Y%m%d_%H%M%S')
+    return f"{stem}@{start}"
+
+
+def ingest_logs(patterns=LOG_GLOBS, path=STORE_PATH):
+    """Add new or changed CSV logs to the session store.
+
+    Stored sessions are kept when their source file is later overwritten or
+    deleted. A file is skipped without re-reading if its size and mtime match
+    what was last ingested from that path. Otherwise it is parsed, and the
+    session with the same id (e.g. a realtime log that has grown since) is replaced.
+    """
+    store = load_store(path)
+
+    sessions = {}  # session id -> (index entry, row columns)
+    for i, session_id in enumerate(store['session_id']):
+        entry = {c: store[c][i] for c in ('kind', 'source', 'start', 'end', 'mtime', 'size')}
+        rows = {c: store[c][session_slice(store, i)] for c in ROW_COLUMNS if c != 'session'}
+        sessions[str(session_id)] = (entry, rows)
+    ingested = {(str(e['source']), float(e['mtime']), int(e['size'])) for e, _ in sessions.values()}
+
+    n_parsed = 0
+    for f in sorted({f for p in patterns for f in glob.glob(p)}):
+        stat = os.stat(f)
+        if (f, float(stat.st_mtime), int(stat.st_size)) in ingested:
+            continue
+
+        kind, rows = parse_log(f)
+        if rows is None:
+            print(f"[!] {f} has no samples, skipping.")
+            continue
+
+        n_parsed += 1
+        sessions[session_id_for(f, rows)] = ({
+            'kind': kind,
+            'source': f,
+            'start': rows['t_abs'][0],
+            'end': rows['t_abs'][-1],
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+        }, rows)
+
+    # Sessions are ordered by start time
+    ordered = sorted(sessions.items(), key=lambda s: s[1][0]['start'])
+    lengths = np.array([len(rows['stress']) for _, (_, rows) in ordered], dtype=np.int64)
+
+    new_store = empty_store()
+    if ordered:
+        for c in ROW_COLUMNS:
+            if c == 'session':
+                new_store[c] = np.repeat(np.arange(len(ordered), dtype=np.int32), lengths)
+            else:
+                new_store[c] = np.concatenate([rows[c] for _, (_, rows) in ordered])
+        for c in ('kind', 'source', 'start', 'end', 'mtime', 'size'):
+            new_store[c] = np.array([entry[c] for _, (entry, _) in ordered])
+        new_store['session_id'] = np.array([sid for sid, _ in ordered])
+        new_store['subject'] = np.array([SUBJECTS.get(sid, DEFAULT_SUBJECT) for sid, _ in ordered])
+        new_store['offset'] = np.r_[0, np.cumsum(lengths)[:-1]]
+        new_store['length'] = lengths
+
+    save_store(new_store, path)
+    print(f"📄 {len(ordered)} sessions in {path} ({n_parsed} files parsed)")
+    return new_store
+
+
+# === Queries === #
+def select(store, sessions=None, subjects=None, start=None, end=None):
+    """Boolean row mask for the given session ids, subjects and epoch-second range."""
+    keep = np.ones(len(store['session_id']), dtype=bool)
+    if sessions is not None:
+        keep &= np.isin(store['session_id'], list(sessions))
+    if subjects is not None:
+        keep &= np.isin(store['subject'], list(subjects))
+    if start is not None:
+        keep &= store['end'] >= start
+    if end is not None:
+        keep &= store['start'] <= end
+
+    mask = np.repeat(keep, store['length'])
+    if start is not None:
+        mask &= store['t_abs'] >= start
+    if end is not None:
+        mask &= store['t_abs'] <= end
+    return mask
+
+
+def sample_durations(store):
+    """Seconds each sample stays current (until the next sample of the same session)."""
+    dt = np.diff(store['t_rel'], append=np.nan)
+    last = store['offset'] + store['length'] - 1
+    dt[last[store['length'] > 0]] = np.nan
+    # The last sample of a session is held for the median sample period
+    median_dt = np.nanmedian(dt) if np.isfinite(dt).any() else LOOP_SLEEP_S
+    return np.where(np.isfinite(dt), dt, median_dt)
+
+
+def per_session(store, values, mask):
+    """Sum of values per session over the masked rows."""
+    return np.bincount(store['session'][mask], weights=values[mask], minlength=len(store['session_id']))
+
+
+def time_above(store, threshold, mask=None):
+    """Seconds per session with stress >= threshold (%)."""
+    mask = np.ones(len(store['stress']), dtype=bool) if mask is None else mask
+    above = (store['stress'] >= threshold) & mask
+    return per_session(store, sample_durations(store), above)
+
+
+def actuation_counts(store, mask=None):
+    mask = np.ones(len(store['stress']), dtype=bool) if mask is None else mask
+    return per_session(store, store['actuated'].astype(np.float64), mask).astype(np.int64)
+
+
+def windowed_stress_average(store, window_s, mask=None):
+    """Mean stress % per session in consecutive windows of window_s seconds.
+
+    Returns an (n_sessions, n_windows) array, NaN where a window has no samples.
+    """
+    mask = np.ones(len(store['stress']), dtype=bool) if mask is None else mask
+    window = (store['t_rel'][mask] // window_s).astype(np.int64)
+    n_windows = int(window.max()) + 1 if window.size else 0
+    key = store['session'][mask].astype(np.int64) * n_windows + window
+    size = len(store['session_id']) * n_windows
+
+    sums = np.bincount(key, weights=store['stress'][mask], minlength=size)
+    counts = np.bincount(key, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sums / counts).reshape(len(store['session_id']), n_windows)
+
+
+def latency_percentiles(store, percentiles=(50, 90, 99), mask=None):
+    """Latency (ms) percentiles per session, shape (n_sessions, len(percentiles))."""
+    mask = np.ones(len(store['stress']), dtype=bool) if mask is None else mask
+    session = store['session'][mask]
+    latency = store['latency_ms'][mask]
+    order = np.lexsort((latency, session))
+    session, latency = session[order], latency[order]
+
+    counts = np.bincount(session, minlength=len(store['session_id']))
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    result = np.full((len(counts), len(percentiles)), np.nan)
+    has_rows = counts > 0
+    for j, p in enumerate(percentiles):
+        # Nearest-rank percentile within each session's sorted run
+        rank = np.ceil(p / 100 * counts).astype(np.int64) - 1
+        idx = starts + np.clip(rank, 0, None)
+        result[has_rows, j] = latency[idx[has_rows]]
+    return result
+
+
+# === Plotting === #
+def decimate(x, y, max_points=MAX_PLOT_POINTS):
+    """Min/max decimation: keeps each bucket's extremes so spikes survive."""
+    if len(y) <= max_points:
+        return x, y
+    bucket = int(np.ceil(len(y) / (max_points // 2)))
+    n = len(y) // bucket * bucket
+    blocks = y[:n].reshape(-1, bucket)
+    base = np.arange(0, n, bucket)
+    idx = np.sort(np.r_[base + blocks.argmin(axis=1), base + blocks.argmax(axis=1)])
+    idx = np.unique(np.r_[idx, np.arange(n, len(y))])
+    return x[idx], y[idx]
+
+
+def plot_sessions(store, mask=None, path=PLOT_PATH):
+    import matplotlib.pyplot as plt
+
+    mask = np.ones(len(store['stress']), dtype=bool) if mask is None else mask
+    plt.figure(figsize=(12, 6))
+    for i, session_id in enumerate(store['session_id']):
+        rows = session_slice(store, i)
+        keep = mask[rows]
+        if not keep.any():
+            continue
+        x, y = decimate(store['t_rel'][rows][keep], store['stress'][rows][keep])
+        plt.plot(x, y, linewidth=1, alpha=0.8, label=f"{session_id} ({store['kind'][i]})")
+
+    plt.axhline(y=MODERATE_THRESHOLD, color='yellow', linestyle='--', alpha=0.7, label='Moderate Stress (50%)')
+    plt.axhline(y=HIGH_THRESHOLD, color='red', linestyle='--', alpha=0.7, label='High Stress (90%)')
+    plt.xlabel("Session Time (s)")
+    plt.ylabel("Stress Probability (%)")
+    plt.title("📊 Stress Across Sessions")
+    plt.ylim(0, 100)
+    plt.grid(True)
+    plt.legend(fontsize=8)
+    plt.tight_layout()
+    plt.savefig(path)
+    print(f"🖼️ Plot saved to {path}")
+
+
+# === Main === #
+if __name__ == "__main__":
+    store = ingest_logs()
+
+    if len(store['session_id']):
+        t1 = time.perf_counter()
+        mask = select(store)
+        durations = per_session(store, sample_durations(store), mask)
+        counts = per_session(store, np.ones(len(store['stress'])), mask)
+        mean_stress = per_session(store, store['stress'].astype(np.float64), mask) / np.maximum(counts, 1)
+        above_moderate = time_above(store, MODERATE_THRESHOLD, mask)
+        above_high = time_above(store, HIGH_THRESHOLD, mask)
+        latency = latency_percentiles(store, (50, 95), mask)
+        actuations = actuation_counts(store, mask)
+        windows = windowed_stress_average(store, 10, mask)
+        t2 = time.perf_counter()
+
+        for i, session_id in enumerate(store['session_id']):
+            print(
+                f"{session_id:<44} {store['kind'][i]:<8} {int(counts[i]):6d} samples | "
+                f"{durations[i]:6.1f} s | 🧠 Avg {mean_stress[i]:5.1f}% | "
+                f">50%: {above_moderate[i]:6.1f} s | >90%: {above_high[i]:6.1f} s | "
+                f"⏱️ p50 {latency[i, 0]:6.1f} ms p95 {latency[i, 1]:6.1f} ms | "
+                f"Actuations: {actuations[i]}"
+            )
+        print(f"⏱️ Queries over {len(store['stress'])} samples took {(t2 - t1) * 1000:.2f} ms "
+              f"({windows.shape[1]} x 10 s windows)")
+
+        plot_sessions(store, mask)
@@ -0,0 +1,287 @@
+# optimize_models.py
+
+import os
+import csv
+import gzip
+import time
+import numpy as np
+import tensorflow as tf
+
+from eeg_dataset import data_path_for, load_dataset, compute_metrics
+
+# Pruning needs the TensorFlow Model Optimization toolkit; without it we still
+# export and benchmark the quantized variants.
+try:
+    import tensorflow_model_optimization as tfmot
+except ImportError:
+    tfmot = None
+
+# === Settings === #
+MODELS_DIR = 'models'
+OUTPUT_DIR = 'models/optimized'
+REPORT_PATH = 'models/optimized/benchmark_report.csv'
+
+PRUNE = True              # Also export pruned variants (requires tensorflow-model-optimization)
+PRUNE_SPARSITY = 0.5      # Fraction of Dense weights zeroed out
+PRUNE_EPOCHS = 2          # Fine-tuning epochs while pruning
+
+N_LATENCY_SAMPLES = 200   # Single-sample predictions timed per variant
+BATCH_SIZE = 32           # Batch size for per-batch latency
+N_BATCH_REPEATS = 50      # Batch predictions timed per variant
+N_REPRESENTATIVE = 500    # Samples used to calibrate int8 ranges
+ACCURACY_BUDGET = 0.01    # Max accuracy drop allowed vs. the original model
+
+
+# === Export === #
+def convert_to_tflite(model, mode, X_train, sparse=False):
+    """Convert a Keras model to a TFLite flatbuffer.
+
+    mode is 'float32', 'float16' or 'int8'. Inputs and outputs stay float32 so
+    the converted model is a drop-in replacement for the real-time scripts.
+    sparse=True stores pruned weights in a sparse format.
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    optimizations = [tf.lite.Optimize.EXPERIMENTAL_SPARSITY] if sparse else []
+
+    if mode == 'float16':
+        optimizations.append(tf.lite.Optimize.DEFAULT)
+        converter.target_spec.supported_types = [tf.float16]
+    elif mode == 'int8':
+        def representative_dataset():
+            for sample in X_train[:N_REPRESENTATIVE]:
+                yield [sample[np.newaxis, ...]]
+
+        optimizations.append(tf.lite.Optimize.DEFAULT)
+        converter.representative_dataset = representative_dataset
+
+    converter.optimizations = optimizations
+    return converter.convert()
+
+
+def prune_model(model_file, X_train, y_train):
+    """Magnitude-prune the Dense layers and fine-tune for a few epochs.
+
+    Works on a freshly loaded copy so the unpruned variants are not modified.
+    """
+    model = tf.keras.models.load_model(model_file)
+
+    def apply_pruning(layer):
+        if isinstance(layer, tf.keras.layers.Dense):
+            return tfmot.sparsity.keras.prune_low_magnitude(
+                layer,
+                pruning_schedule=tfmot.sparsity.keras.ConstantSparsity(PRUNE_SPARSITY, begin_step=0),
+            )
+        return layer
+
+    pruned = tf.keras.models.clone_model(model, clone_function=apply_pruning)
+    pruned.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
+    pruned.fit(
+        X_train, y_train,
+        epochs=PRUNE_EPOCHS,
+        batch_size=32,
+        callbacks=[tfmot.sparsity.keras.UpdatePruningStep()],
+        verbose=0,
+    )
+    return tfmot.sparsity.keras.strip_pruning(pruned)
+
+
+def export_variants(model_file, X_train, y_train):
+    """Write every quantized/pruned variant of one model to OUTPUT_DIR."""
+    base_name = os.path.splitext(os.path.basename(model_file))[0]
+    exported = {}
+
+    sources = [('', tf.keras.models.load_model(model_file), False)]
+    if PRUNE:
+        if tfmot is None:
+            print("[!] tensorflow-model-optimization not installed, skipping pruned variants.")
+        else:
+            try:
+                sources.append(('pruned_', prune_model(model_file, X_train, y_train), True))
+            except ValueError as e:
+                # tfmot only supports Keras 2 layers; tf.keras is Keras 3 from TF 2.16
+                print(f"[!] Pruning not supported by this TensorFlow/Keras version, skipping: {e}")
+
+    for prefix, source, sparse in sources:
+        for mode in ('float32', 'float16', 'int8'):
+            variant = f"{prefix}{mode}"
+            path = os.path.join(OUTPUT_DIR, f"{base_name}_{variant}.tflite")
+            with open(path, 'wb') as f:
+                f.write(convert_to_tflite(source, mode, X_train, sparse=sparse))
+            exported[variant] = path
+            print(f"💾 Exported {path}")
+
+    return exported
+
+
+# === Benchmark === #
+def gzipped_size(path):
+    """Compressed file size; zeroed (pruned) weights only shrink after compression."""
+    with open(path, 'rb') as f:
+        return len(gzip.compress(f.read()))
+
+
+def keras_memory(model):
+    """Bytes of weights plus float32 activations for one sample."""
+    weight_bytes = sum(w.nbytes for w in model.get_weights())
+    activation_bytes = sum(int(np.prod(layer.output.shape[1:])) * 4 for layer in model.layers)
+    return weight_bytes + activation_bytes
+
+
+def tflite_memory(interpreter):
+    """Bytes of all interpreter tensors (weights and activations) as currently allocated."""
+    return sum(
+        int(np.prod(t['shape'])) * np.dtype(t['dtype']).itemsize
+        for t in interpreter.get_tensor_details()
+    )
+
+
+def time_calls(predict, batches):
+    """Median wall time (ms) of predict over the given batches, after one warm-up call."""
+    predict(batches[0])  # Warm-up
+    timings = []
+    for batch in batches:
+        t1 = time.perf_counter()
+        predict(batch)
+        timings.append(time.perf_counter() - t1)
+    return float(np.median(timings)) * 1000
+
+
+def time_per_sample(predict, samples):
+    return time_calls(predict, [sample[np.newaxis, ...] for sample in samples])
+
+
+def time_per_batch(predict, batch):
+    return time_calls(predict, [batch] * N_BATCH_REPEATS)
+
+
+def benchmark_keras(model_file, X_test):
+    model = tf.keras.models.load_model(model_file)
+
+    # model.predict sets the input, runs the model and returns the output,
+    # exactly as the real-time scripts call it
+    def predict(batch):
+        return model.predict(batch, verbose=0)
+
+    return {
+        'y_pred': predict(X_test),
+        'per_sample_ms': time_per_sample(predict, X_test[:N_LATENCY_SAMPLES]),
+        'per_batch_ms': time_per_batch(predict, X_test[:BATCH_SIZE]),
+        'size': os.path.getsize(model_file),
+        'gzip_size': gzipped_size(model_file),
+        'memory': keras_memory(model),
+    }
+
+
+def benchmark_tflite(tflite_path, X_test):
+    interpreter = tf.lite.Interpreter(model_path=tflite_path)
+    input_index = interpreter.get_input_details()[0]['index']
+    output_index = interpreter.get_output_details()[0]['index']
+
+    def allocate(shape):
+        interpreter.resize_tensor_input(input_index, shape)
+        interpreter.allocate_tensors()
+
+    # Same steps as Keras: set the input, invoke and read the output.
+    # Tensors are allocated once per batch size, outside the timed calls.
+    def predict(batch):
+        interpreter.set_tensor(input_index, batch)
+        interpreter.invoke()
+        return interpreter.get_tensor(output_index)
+
+    allocate((1, 1, 2))
+    per_sample_ms = time_per_sample(predict, X_test[:N_LATENCY_SAMPLES])
+    memory = tflite_memory(interpreter)  # Allocated for one sample, like keras_memory
+
+    batch = X_test[:BATCH_SIZE]
+    allocate(batch.shape)
+    per_batch_ms = time_per_batch(predict, batch)
+
+    allocate(X_test.shape)
+    return {
+        'per_sample_ms': per_sample_ms,
+        'memory': memory,
+        'per_batch_ms': per_batch_ms,
+        'y_pred': predict(X_test),
+        'size': os.path.getsize(tflite_path),
+        'gzip_size': gzipped_size(tflite_path),
+    }
+
+
+def make_row(model_name, variant, y_test, result):
+    metrics = compute_metrics(np.argmax(y_test, axis=1), np.argmax(result['y_pred'], axis=1))
+    return {
+        'Model': model_name,
+        'Variant': variant,
+        'Size (KB)': result['size'] / 1024,
+        'Gzipped Size (KB)': result['gzip_size'] / 1024,
+        'Runtime Memory (KB)': result['memory'] / 1024,
+        'Per-sample Latency (ms)': result['per_sample_ms'],
+        f'Per-batch Latency (ms, n={BATCH_SIZE})': result['per_batch_ms'],
+        'Accuracy': metrics['accuracy'],
+        'Precision': metrics['precision'],
+        'Recall': metrics['recall'],
+        'F1 Score': metrics['f1'],
+    }
+
+
+def pick_fastest(rows):
+    """Fastest variant per model whose accuracy stays within ACCURACY_BUDGET."""
+    picks = {}
+    for model_name in dict.fromkeys(r['Model'] for r in rows):
+        model_rows = [r for r in rows if r['Model'] == model_name]
+        baseline = next(r for r in model_rows if r['Variant'] == 'keras')
+        allowed = [r for r in model_rows if baseline['Accuracy'] - r['Accuracy'] <= ACCURACY_BUDGET]
+        picks[model_name] = min(allowed, key=lambda r: r['Per-sample Latency (ms)'])
+    return picks
+
+
+# === Main === #
+if __name__ == "__main__":
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    rows = []
+
+    model_files = sorted(
+        os.path.join(MODELS_DIR, f) for f in os.listdir(MODELS_DIR) if f.endswith('.h5')
+    )
+
+    for model_file in model_files:
+        model_name = os.path.splitext(os.path.basename(model_file))[0]
+        data_path = data_path_for(model_file)
+        if not os.path.isfile(data_path):
+            print(f"[!] No training data at {data_path}, skipping {model_name}.")
+            continue
+
+        print(f"🤖 Optimizing {model_name} (data: {data_path})")
+        X_train, X_test, y_train, y_test = load_dataset(data_path)
+
+        rows.append(make_row(model_name, 'keras', y_test, benchmark_keras(model_file, X_test)))
+        for variant, tflite_path in export_variants(model_file, X_train, y_train).items():
+            rows.append(make_row(model_name, variant, y_test, benchmark_tflite(tflite_path, X_test)))
+
+    if not rows:
+        print("[!] Nothing to benchmark.")
+    else:
+        # === Save Report === #
+        with open(REPORT_PATH, mode='w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({k: f"{v:.4f}" if isinstance(v, float) else v for k, v in row.items()})
+        print(f"📄 Benchmark report saved to {REPORT_PATH}")
+
+        # === Print Comparison === #
+        for row in rows:
+            print(
+                f"{row['Model']:<32} {row['Variant']:<16} "
+                f"{row['Size (KB)']:8.1f} KB ({row['Gzipped Size (KB)']:.1f} gz) | "
+                f"Mem {row['Runtime Memory (KB)']:7.1f} KB | "
+                f"⏱️ {row['Per-sample Latency (ms)']:7.3f} ms/sample | "
+                f"Acc {row['Accuracy'] * 100:6.2f}% | P {row['Precision']:.4f} | "
+                f"R {row['Recall']:.4f} | F1 {row['F1 Score']:.4f}"
+            )
+
+        for model_name, best in pick_fastest(rows).items():
+            print(
+                f"✅ {model_name}: fastest within {ACCURACY_BUDGET * 100:.1f}% accuracy budget "
+                f"-> {best['Variant']} ({best['Per-sample Latency (ms)']:.3f} ms/sample)"
+            )